@@ -0,0 +1,107 @@
+# api/ai_cache.py
+"""
+In-process caches for AI answers.
+
+- TTLCache: exact-match cache keyed by a content hash (question + deal brief).
+- SemanticCache: optional second layer that reuses an answer for a paraphrased
+  question about the same deal, by cosine similarity of question embeddings.
+
+Both are per-process and bounded; entries are only written for successful
+OpenAI answers, never for deterministic fallbacks.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+V = TypeVar("V")
+
+
+def cache_key(*parts: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")  # separator so ("ab", "c") != ("a", "bc")
+    return h.hexdigest()
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+class TTLCache(Generic[V]):
+    """LRU-bounded mapping whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache(Generic[V]):
+    """
+    Nearest-neighbour answer lookup, scoped (e.g. per deal brief) so a paraphrase
+    only ever matches questions asked about the same deal.
+    """
+
+    def __init__(self, threshold: float = 0.93, max_scopes: int = 1000, per_scope: int = 64, ttl: float = 3600) -> None:
+        self.threshold = threshold
+        self.per_scope = per_scope
+        self._scopes: TTLCache[Tuple[np.ndarray, List[V]]] = TTLCache(maxsize=max_scopes, ttl=ttl)
+
+    @staticmethod
+    def _unit(embedding: Sequence[float]) -> np.ndarray:
+        v = np.asarray(embedding, dtype=np.float32)
+        n = float(np.linalg.norm(v))
+        return v / n if n else v
+
+    def lookup(self, scope: str, embedding: Sequence[float]) -> Optional[V]:
+        entry = self._scopes.get(scope)
+        if entry is None:
+            return None
+        matrix, values = entry
+        sims = matrix @ self._unit(embedding)  # rows are unit vectors -> cosine similarity
+        best = int(np.argmax(sims))
+        return values[best] if sims[best] >= self.threshold else None
+
+    def add(self, scope: str, embedding: Sequence[float], value: V) -> None:
+        row = self._unit(embedding)[None, :]
+        entry = self._scopes.get(scope)
+        if entry is None:
+            matrix, values = row, [value]
+        else:
+            matrix, values = np.vstack([entry[0], row])[-self.per_scope:], (entry[1] + [value])[-self.per_scope:]
+        self._scopes.set(scope, (matrix, values))
+
+
+async def embed(client: Any, model: str, text: str) -> Optional[List[float]]:
+    try:
+        resp = await client.embeddings.create(model=model, input=text)
+        return list(resp.data[0].embedding)
+    except Exception:
+        return None
@@ -0,0 +1,105 @@
+# api/batch_ai.py
+"""
+OpenAI Batch API helpers for bulk, non-interactive AI workloads.
+
+Used by /ai/explain/bulk: requests are written as one JSONL file, uploaded
+once and processed asynchronously by OpenAI at half the per-token price.
+Each line's custom_id carries the position of the deal in the submitted
+list, so results can be matched back without keeping any server-side state.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+MAX_REQUESTS_PER_BATCH = 50_000  # OpenAI Batch API limit per input file
+
+_CUSTOM_ID_PREFIX = "deal-"
+
+
+@dataclass(frozen=True)
+class BatchOutput:
+    index: int
+    content: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _custom_id(index: int) -> str:
+    return f"{_CUSTOM_ID_PREFIX}{index}"
+
+
+def _index_of(custom_id: Any) -> Optional[int]:
+    # None for lines this module did not write (foreign or malformed custom_id)
+    if not isinstance(custom_id, str) or not custom_id.startswith(_CUSTOM_ID_PREFIX):
+        return None
+    digits = custom_id[len(_CUSTOM_ID_PREFIX):]
+    return int(digits) if digits.isdecimal() else None
+
+
+def build_jsonl(model: str, conversations: List[List[Dict[str, str]]], **params: Any) -> bytes:
+    lines = [
+        orjson.dumps(
+            {
+                "custom_id": _custom_id(i),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": {"model": model, "messages": messages, **params},
+            }
+        )
+        for i, messages in enumerate(conversations)
+    ]
+    return b"\n".join(lines) + b"\n"
+
+
+async def submit_chat_batch(client: Any, model: str, conversations: List[List[Dict[str, str]]], **params: Any):
+    """Upload the requests as a JSONL file and start a batch job; returns the OpenAI Batch object."""
+    upload = await client.files.create(
+        file=("requests.jsonl", build_jsonl(model, conversations, **params)),
+        purpose="batch",
+    )
+    return await client.batches.create(
+        input_file_id=upload.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=COMPLETION_WINDOW,
+    )
+
+
+def _parse_output_line(line: Dict[str, Any]) -> Optional[BatchOutput]:
+    index = _index_of(line.get("custom_id"))
+    if index is None:
+        return None
+    if line.get("error"):
+        return BatchOutput(index=index, error=str(line["error"].get("message") or line["error"]))
+
+    response = line.get("response") or {}
+    if response.get("status_code") != 200:
+        return BatchOutput(index=index, error=f"Upstream status {response.get('status_code')}.")
+
+    choices = (response.get("body") or {}).get("choices") or []
+    if not choices:
+        return BatchOutput(index=index, error="Empty completion.")
+    return BatchOutput(index=index, content=choices[0]["message"].get("content") or "")
+
+
+async def _read_jsonl(client: Any, file_id: Optional[str]) -> List[Dict[str, Any]]:
+    if not file_id:
+        return []
+    content = await client.files.content(file_id)
+    return [orjson.loads(line) for line in content.text.splitlines() if line.strip()]
+
+
+async def fetch_chat_batch(client: Any, job_id: str) -> Tuple[str, List[BatchOutput]]:
+    """
+    Return (status, outputs); outputs stay empty until the job has produced result files.
+    Lines whose custom_id was not written by build_jsonl are skipped.
+    """
+    batch = await client.batches.retrieve(job_id)
+    lines = await _read_jsonl(client, batch.output_file_id) + await _read_jsonl(client, batch.error_file_id)
+    parsed = (_parse_output_line(line) for line in lines)
+    outputs = sorted((o for o in parsed if o is not None), key=lambda o: o.index)
+    return batch.status, outputs
@@ -1,18 +1,27 @@
 # api/main.py
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
 import os
 import re
+from contextlib import asynccontextmanager
 from datetime import date
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
+from api import ai_cache, batch_ai
+
 # =========================
 # Load environment variablesw
 # =========================
@@ -22,13 +31,29 @@ load_dotenv(ROOT_DIR / ".env")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "").strip()
 MODEL_NAME = os.getenv("OPENAI_MODEL", "gpt-4o-mini").strip()
 FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "").strip()
+MAX_CONCURRENT_OPENAI = int(os.getenv("MAX_CONCURRENT_OPENAI", "8"))  # /ai/qa/batch fan-out only
+OPENAI_HTTP_BACKEND = os.getenv("OPENAI_HTTP_BACKEND", "httpx").strip().lower()  # httpx | aiohttp
+EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small").strip()
+AI_CACHE_MAXSIZE = int(os.getenv("AI_CACHE_MAXSIZE", "10000"))
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", "3600"))
+AI_STREAM_TIMEOUT = float(os.getenv("AI_STREAM_TIMEOUT", "15"))
+AI_SEMANTIC_CACHE = os.getenv("AI_SEMANTIC_CACHE", "").strip().lower() in ("1", "true", "yes")
 
 # =========================
 # App creation (ONLY ONCE)
 # =========================
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    await _open_openai_client()
+    try:
+        yield
+    finally:
+        await _close_openai_client()
+
 app = FastAPI(
     title="Corporate RM AI Assistant",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=_lifespan,
 )
 
 # =========================
@@ -49,10 +74,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses (deal summaries, bulk results). Responses that already carry a
+# Content-Encoding (the precompressed index.html) are left untouched, and so are SSE streams
+# (text/event-stream is excluded by default since Starlette 0.46; see api/requirements.txt).
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+
 # =========================
 # Schemas
 # =========================
 from api.schemas import (
+    AIExplainBulkItem,
+    AIExplainBulkJob,
+    AIExplainBulkResult,
     AIExplainRequest,
     AIExplainResponse,
     AIQARequest,
@@ -64,14 +97,55 @@ from api.schemas import (
 # =========================
 # OpenAI client
 # =========================
+# One pooled, keep-alive HTTP client for the whole process so TLS handshakes are not
+# repeated per call. Created on startup and closed on shutdown (see _lifespan).
 oa_client = None
-if OPENAI_API_KEY:
+_oa_http_client = None
+
+async def _open_openai_client() -> None:
+    global oa_client, _oa_http_client
+    if not OPENAI_API_KEY:
+        return
     try:
-        from openai import OpenAI
-        oa_client = OpenAI(api_key=OPENAI_API_KEY)
+        from openai import DEFAULT_CONNECTION_LIMITS, AsyncOpenAI, DefaultAsyncHttpxClient, Timeout
+
+        # Build limits/timeout from the SDK's own exports so they match whichever httpx it bundles
+        limits = type(DEFAULT_CONNECTION_LIMITS)(max_connections=100, max_keepalive_connections=50)
+        _oa_http_client = None
+        if OPENAI_HTTP_BACKEND == "aiohttp":
+            # aiohttp transport holds up better than httpx at high concurrency; needs openai[aiohttp]
+            try:
+                from openai import DefaultAioHttpClient
+
+                _oa_http_client = DefaultAioHttpClient(limits=limits)
+            except (ImportError, RuntimeError):
+                _oa_http_client = None
+        if _oa_http_client is None:
+            _oa_http_client = DefaultAsyncHttpxClient(limits=limits)
+        oa_client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            http_client=_oa_http_client,
+            timeout=Timeout(30.0, connect=5.0),
+        )
     except Exception:
         oa_client = None
 
+async def _close_openai_client() -> None:
+    global oa_client, _oa_http_client
+    if _oa_http_client is not None:
+        await _oa_http_client.aclose()
+    oa_client = None
+    _oa_http_client = None
+
+# Caps questions in flight from /ai/qa/batch fan-outs, so one large batch can't burst past
+# upstream rate limits. Single /ai/qa, /ai/explain and stream calls are not counted.
+_QA_BATCH_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_OPENAI)
+
+# Answer caches (per process); only successful OpenAI answers are stored
+_QA_CACHE = ai_cache.TTLCache(maxsize=AI_CACHE_MAXSIZE, ttl=AI_CACHE_TTL)
+_EXPLAIN_CACHE = ai_cache.TTLCache(maxsize=AI_CACHE_MAXSIZE, ttl=AI_CACHE_TTL)
+_QA_SEMANTIC_CACHE = ai_cache.SemanticCache(threshold=0.93, ttl=AI_CACHE_TTL)
+
 # =========================
 # Step 2 (Hardening): input guardrails
 # =========================
@@ -81,13 +155,47 @@ _SENSITIVE_PATTERNS = [
     re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"),  # email
 ]
 
+# Single alternation so the fallback path scans the text once instead of once per pattern
+_SENSITIVE_RE = re.compile("|".join(f"(?:{p.pattern})" for p in _SENSITIVE_PATTERNS))
+
+# Optional: Hyperscan compiles all patterns into one DFA and scans the text in a single pass.
+# Falls back to the Python regexes above when the package is not installed.
+_HS_DB = None
+try:
+    import hyperscan
+
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(
+        expressions=[p.pattern.encode() for p in _SENSITIVE_PATTERNS],
+        ids=list(range(len(_SENSITIVE_PATTERNS))),
+        elements=len(_SENSITIVE_PATTERNS),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_SENSITIVE_PATTERNS),
+    )
+except Exception:
+    _HS_DB = None
+
+def _hs_on_match(pattern_id, start, end, flags, context) -> bool:
+    context.append(pattern_id)
+    return True  # any hit is enough; stop scanning
+
 def _contains_sensitive(text: str) -> bool:
     if not text:
         return False
     t = text.strip()
     if not t:
         return False
-    return any(p.search(t) for p in _SENSITIVE_PATTERNS)
+    # Every pattern needs a digit or an "@"; most RM free text has neither
+    if "@" not in t and not any(c.isdigit() for c in t):
+        return False
+    # Hyperscan matches bytes, so \d and \b only agree with Python's re on ASCII input
+    if _HS_DB is not None and t.isascii():
+        hits: List[int] = []
+        try:
+            _HS_DB.scan(t.encode("utf-8"), match_event_handler=_hs_on_match, context=hits)
+        except hyperscan.ScanTerminated:
+            pass
+        return bool(hits)
+    return _SENSITIVE_RE.search(t) is not None
 
 def _guard_no_sensitive(*texts: str):
     for t in texts:
@@ -104,6 +212,95 @@ def _guard_no_sensitive(*texts: str):
 # =========================
 # Step 3 (Credit logic tightening): deterministic assessment
 # =========================
+_STRENGTH = "strength"
+_CONSTRAINT = "constraint"
+
+# Constraint severity, recorded when the constraint is added; majors drive the readiness status
+_MINOR = 0
+_MAJOR = 1
+
+# Financial signal rules: value -> (bucket, message, RM action or None).
+# Values missing from a table (e.g. "Stable") contribute nothing; every constraint here is major.
+_REVENUE_RULES = {
+    "Improving": (_STRENGTH, "Revenue trend improving over 3 years.", None),
+    "Declining": (
+        _CONSTRAINT,
+        "Revenue trend declining over 3 years.",
+        "Validate orderbook, customer concentration, and recovery plan.",
+    ),
+}
+_MARGIN_RULES = {
+    "Improving": (_STRENGTH, "Margins improving over 3 years.", None),
+    "Under Pressure": (
+        _CONSTRAINT,
+        "Margins under pressure; risk to debt service capacity.",
+        "Assess pricing power, input cost pass-through, and covenant buffers.",
+    ),
+}
+_LEVERAGE_RULES = {
+    "Low": (_STRENGTH, "Low leverage position.", None),
+    "Elevated": (
+        _CONSTRAINT,
+        "Elevated leverage position; reduced headroom.",
+        "Consider structure support: amortisation, covenants, collateral, DSRA/DSCR.",
+    ),
+}
+_CASHFLOW_RULES = {
+    "Strong": (_STRENGTH, "Strong cash flow quality.", None),
+    "Weak": (
+        _CONSTRAINT,
+        "Weak cash flow quality; potential working-capital stress.",
+        "Request WC cycle analysis, ageing, and evidence of collections discipline.",
+    ),
+}
+_VOLATILITY_RULES = {
+    "High": (
+        _CONSTRAINT,
+        "High earnings volatility; needs stronger controls/monitoring.",
+        "Add monitoring triggers and tighten covenants; test downside scenarios.",
+    ),
+}
+_CAPEX_RULES = {
+    "High": (
+        _CONSTRAINT,
+        "High capex/growth investment increases execution risk.",
+        "Validate capex plan, milestones, contingencies, and sponsor support.",
+    ),
+}
+_TRANSPARENCY_RULES = {
+    "Weak": (
+        _CONSTRAINT,
+        "Weak financial transparency limits credit comfort.",
+        "Obtain audited financials, detailed management accounts, and bank statements.",
+    ),
+}
+
+# Evaluation order drives the order of strengths/constraints/actions in the output
+_FIELD_RULES = (
+    ("revenue_trend_3y", _REVENUE_RULES),
+    ("margin_trend_3y", _MARGIN_RULES),
+    ("leverage_position", _LEVERAGE_RULES),
+    ("cashflow_quality", _CASHFLOW_RULES),
+    ("earnings_volatility", _VOLATILITY_RULES),
+    ("capex_growth_investment", _CAPEX_RULES),
+    ("financial_transparency", _TRANSPARENCY_RULES),
+)
+
+_STATUS_TALK = {
+    "Strong": "Mandate fit is clear; focus discussion on facility sizing and structure.",
+    "Conditional": "Proceed subject to resolving key constraints and tightening structure.",
+    "Weak": "Defer credit appetite until constraints are addressed and visibility improves.",
+}
+
+_STATUS_SUMMARY_TAIL = {
+    status: (
+        f"/6. Deal readiness is assessed as {status} based on "
+        "rating anchor, eligibility strength, and RM-level financial signals (revenue/margin/leverage/"
+        "cash flow/volatility/transparency)."
+    )
+    for status in _STATUS_TALK
+}
+
 def _assess_deal(payload: DealInputRequest) -> DealSummaryResponse:
     # --- Guardrails (apply to any free-text fields)
     _guard_no_sensitive(payload.client_name, payload.group_name or "", payload.notes or "")
@@ -112,12 +309,17 @@ def _assess_deal(payload: DealInputRequest) -> DealSummaryResponse:
     constraints: List[str] = []
     rm_actions: List[str] = []
     talking_points: List[str] = []
+    severities: List[int] = []  # parallel to constraints
+
+    def add_constraint(msg: str, severity: int = _MAJOR) -> None:
+        constraints.append(msg)
+        severities.append(severity)
 
     # Rating anchor signals (simple)
     if payload.rating_anchor.grade.strip():
         strengths.append(f"Rating anchor available from {payload.rating_anchor.system}.")
     else:
-        constraints.append("No rating grade provided; cannot anchor risk positioning.")
+        add_constraint("No rating grade provided; cannot anchor risk positioning.", _MINOR)
         rm_actions.append("Obtain/confirm latest internal/external rating grade and date.")
 
     # Eligibility score (0–6)
@@ -126,67 +328,31 @@ def _assess_deal(payload: DealInputRequest) -> DealSummaryResponse:
         strengths.append(f"Strong strategic eligibility score ({s:.1f}/6).")
     elif s >= 3.0:
         strengths.append(f"Moderate strategic eligibility score ({s:.1f}/6).")
-        constraints.append("Eligibility is not strongly differentiated vs. strategic mandate.")
+        add_constraint("Eligibility is not strongly differentiated vs. strategic mandate.", _MINOR)
         rm_actions.append("Strengthen eligibility case (job creation, exports, ICV, localisation, etc.).")
     else:
-        constraints.append(f"Weak strategic eligibility score ({s:.1f}/6).")
+        add_constraint(f"Weak strategic eligibility score ({s:.1f}/6).")
         rm_actions.append("Rework mandate alignment narrative and quantify eligibility drivers.")
 
     if payload.eligibility.drivers:
         strengths.append("Eligibility drivers provided.")
 
-    # Financial signals
+    # Financial signals (data-driven; see _FIELD_RULES)
     fs = payload.financial_signals
-
-    # Revenue
-    if fs.revenue_trend_3y == "Improving":
-        strengths.append("Revenue trend improving over 3 years.")
-    elif fs.revenue_trend_3y == "Declining":
-        constraints.append("Revenue trend declining over 3 years.")
-        rm_actions.append("Validate orderbook, customer concentration, and recovery plan.")
-
-    # Margin
-    if fs.margin_trend_3y == "Improving":
-        strengths.append("Margins improving over 3 years.")
-    elif fs.margin_trend_3y == "Under Pressure":
-        constraints.append("Margins under pressure; risk to debt service capacity.")
-        rm_actions.append("Assess pricing power, input cost pass-through, and covenant buffers.")
-
-    # Leverage
-    if fs.leverage_position == "Low":
-        strengths.append("Low leverage position.")
-    elif fs.leverage_position == "Elevated":
-        constraints.append("Elevated leverage position; reduced headroom.")
-        rm_actions.append("Consider structure support: amortisation, covenants, collateral, DSRA/DSCR.")
-
-    # Cash flow quality
-    if fs.cashflow_quality == "Strong":
-        strengths.append("Strong cash flow quality.")
-    elif fs.cashflow_quality == "Weak":
-        constraints.append("Weak cash flow quality; potential working-capital stress.")
-        rm_actions.append("Request WC cycle analysis, ageing, and evidence of collections discipline.")
-
-    # Earnings volatility
-    if fs.earnings_volatility == "High":
-        constraints.append("High earnings volatility; needs stronger controls/monitoring.")
-        rm_actions.append("Add monitoring triggers and tighten covenants; test downside scenarios.")
-
-    # Capex/investment
-    if fs.capex_growth_investment == "High":
-        constraints.append("High capex/growth investment increases execution risk.")
-        rm_actions.append("Validate capex plan, milestones, contingencies, and sponsor support.")
-
-    # Transparency
-    if fs.financial_transparency == "Weak":
-        constraints.append("Weak financial transparency limits credit comfort.")
-        rm_actions.append("Obtain audited financials, detailed management accounts, and bank statements.")
+    for field_name, table in _FIELD_RULES:
+        rule = table.get(getattr(fs, field_name))
+        if rule:
+            bucket, msg, action = rule
+            if bucket == _CONSTRAINT:
+                add_constraint(msg)
+            else:
+                strengths.append(msg)
+            if action:
+                rm_actions.append(action)
 
     # Determine readiness
     # Simple rule: any "major" constraints -> Conditional, multiple -> Weak
-    major_count = 0
-    for c in constraints:
-        if any(k in c.lower() for k in ["declining", "under pressure", "elevated", "weak", "high"]):
-            major_count += 1
+    major_count = sum(severities)
 
     if major_count >= 3:
         status = "Weak"
@@ -196,20 +362,17 @@ def _assess_deal(payload: DealInputRequest) -> DealSummaryResponse:
         status = "Strong"
 
     # Talking points (RM-friendly)
-    if status == "Strong":
-        talking_points.append("Mandate fit is clear; focus discussion on facility sizing and structure.")
-    elif status == "Conditional":
-        talking_points.append("Proceed subject to resolving key constraints and tightening structure.")
-    else:
-        talking_points.append("Defer credit appetite until constraints are addressed and visibility improves.")
-
-    # Mandate fit summary (1 paragraph)
-    mandate_fit_summary = (
-        f"{payload.client_name} sits in the '{payload.sector}' sector with eligibility score "
-        f"{payload.eligibility.score:.1f}/6. Deal readiness is assessed as {status} based on "
-        f"rating anchor, eligibility strength, and RM-level financial signals (revenue/margin/leverage/"
-        f"cash flow/volatility/transparency)."
-    )
+    talking_points.append(_STATUS_TALK[status])
+
+    # Mandate fit summary (1 paragraph); only name, sector and score vary per request
+    mandate_fit_summary = "".join((
+        payload.client_name,
+        " sits in the '",
+        payload.sector,
+        "' sector with eligibility score ",
+        f"{payload.eligibility.score:.1f}",
+        _STATUS_SUMMARY_TAIL[status],
+    ))
 
     return DealSummaryResponse(
         client_name=payload.client_name,
@@ -230,48 +393,97 @@ def _assess_deal(payload: DealInputRequest) -> DealSummaryResponse:
 # =========================
 # API endpoints
 # =========================
+# _assess_deal is a pure function of the payload (plus today's date for created_at)
+_ASSESS_CACHE = ai_cache.TTLCache(maxsize=2048, ttl=AI_CACHE_TTL)
+
 @app.post("/assess", response_model=DealSummaryResponse)
-def assess_deal(payload: DealInputRequest):
-    return _assess_deal(payload)
+async def assess_deal(payload: DealInputRequest):
+    # async: pure CPU, no I/O, and it keeps _ASSESS_CACHE (not thread-safe) on the event loop
+    key = ai_cache.cache_key(date.today().isoformat(), payload.model_dump_json())
+    summary = _ASSESS_CACHE.get(key)
+    if summary is None:
+        summary = _assess_deal(payload)
+        _ASSESS_CACHE.set(key, summary)
+    return summary
 
 
 # Keep your old scoring endpoint if you still use it elsewhere
 # (Safe stub: you can remove if not needed)
 @app.post("/api/score")
-def api_score(payload: Dict[str, Any]):
+async def api_score(payload: Dict[str, Any]):
     # This is intentionally a placeholder.
     # If you still have the LightGBM PD model path, keep your original /api/score code.
+    # async: no blocking work here, so skip the threadpool hop entirely.
     return {"ok": True, "message": "Use POST /assess for deal readiness MVP."}
 
 
 # =========================
 # AI helpers
 # =========================
-def _deal_to_brief(deal: DealSummaryResponse) -> str:
-    # deal is a Pydantic object, so use model_dump()
-    d = deal.model_dump()
-    dr = d.get("deal_readiness", {}) or {}
+AI_DISCLAIMER = (
+    "Do not enter confidential/internal customer data into external AI. "
+    "Use anonymised inputs only. Outputs are decision-support and must be reviewed by a qualified banker."
+)
+
+# Frozen system prompts: identical on every call so they form a cache-eligible prefix
+SYS_PROMPT_QA = (
+    "You are a corporate banking RM copilot. Answer the user's question using ONLY the deal summary.\n"
+    "If the deal summary is missing something, say what is missing and propose RM next steps.\n"
+    "Be concise and structured. Avoid hallucinations. No confidential data."
+)
+SYS_PROMPT_EXPLAIN = (
+    "You are a corporate banking RM copilot. You must be concise, practical, and risk-aware.\n"
+    "You must NOT invent data. Use only the deal summary.\n"
+    "Task: produce (1) an executive summary (2) key risks explained (bullets) "
+    "(3) RM talking points (bullets).\n"
+    "Return JSON only, matching the requested fields: "
+    "executive_summary (string), key_risks_explained (list of strings), rm_talking_points (list of strings)."
+)
+
+def _deal_to_key(deal: DealSummaryResponse) -> Tuple[Any, ...]:
+    # Flat, hashable view of exactly the fields the brief uses
+    dr = deal.deal_readiness
     return (
-        f"Client: {d.get('client_name')}\n"
-        f"Sector: {d.get('sector')}\n"
-        f"Rating: {d.get('rating_anchor', {}).get('system')} / {d.get('rating_anchor', {}).get('grade')}\n"
-        f"Eligibility: {d.get('eligibility', {}).get('score')} / 6\n"
-        f"Readiness: {dr.get('status')}\n"
-        f"Strengths: {', '.join(dr.get('strengths', [])[:6])}\n"
-        f"Constraints: {', '.join(dr.get('constraints', [])[:6])}\n"
-        f"RM actions: {', '.join(d.get('rm_actions', [])[:8])}\n"
-        f"Notes: {d.get('notes') or ''}\n"
+        deal.client_name,
+        deal.sector,
+        deal.rating_anchor.system,
+        deal.rating_anchor.grade,
+        deal.eligibility.score,
+        dr.status,
+        tuple(dr.strengths[:6]),
+        tuple(dr.constraints[:6]),
+        tuple(deal.rm_actions[:8]),
+        deal.notes or "",
     )
 
+@lru_cache(maxsize=1024)
+def _brief_from_key(key: Tuple[Any, ...]) -> str:
+    client, sector, system, grade, score, status, strengths, constraints, actions, notes = key
+    parts = [
+        f"Client: {client}",
+        f"Sector: {sector}",
+        f"Rating: {system} / {grade}",
+        f"Eligibility: {score} / 6",
+        f"Readiness: {status}",
+        "Strengths: " + ", ".join(strengths),
+        "Constraints: " + ", ".join(constraints),
+        "RM actions: " + ", ".join(actions),
+        "Notes: " + notes,
+        "",
+    ]
+    return "\n".join(parts)
+
+def _deal_to_brief(deal: DealSummaryResponse) -> str:
+    # The same deal is sent with every explain/Q&A call, so the brief is memoized on its fields
+    return _brief_from_key(_deal_to_key(deal))
+
 def _fallback_ai_qa(question: str, deal: Optional[DealSummaryResponse]) -> str:
     if not deal:
         return "Provide a deal assessment first (POST /assess), then ask a question grounded in the summary."
-    d = deal.model_dump()
-    dr = d.get("deal_readiness", {}) or {}
-    status = dr.get("status", "Conditional")
-    constraints = dr.get("constraints", [])
-    actions = d.get("rm_actions", [])
-    if status == "Strong":
+    # DealSummaryResponse guarantees these fields (default_factory lists), so read them directly
+    constraints = deal.deal_readiness.constraints
+    actions = deal.rm_actions
+    if deal.deal_readiness.status == "Strong":
         return "Proceed to structure discussion: facility sizing, tenor, security, covenants, and pricing calibration."
     if constraints:
         return (
@@ -282,141 +494,312 @@ def _fallback_ai_qa(question: str, deal: Optional[DealSummaryResponse]) -> str:
         )
     return "Focus on clarifying rating anchor, eligibility drivers, and the weakest financial signals."
 
-def _ai_disclaimer() -> str:
-    return (
-        "Do not enter confidential/internal customer data into external AI. "
-        "Use anonymised inputs only. Outputs are decision-support and must be reviewed by a qualified banker."
+def _fallback_ai_explain(deal: DealSummaryResponse) -> AIExplainResponse:
+    return AIExplainResponse(
+        executive_summary=deal.mandate_fit_summary,
+        key_risks_explained=deal.deal_readiness.constraints[:6],
+        rm_talking_points=deal.talking_points[:6],
+        disclaimer=AI_DISCLAIMER,
     )
 
+def _qa_messages(question: str, brief: Optional[str]) -> List[Dict[str, str]]:
+    # Static instructions first, then the deal, then the question: keeps the longest
+    # possible prefix identical across calls so OpenAI prompt caching can reuse it.
+    return [
+        {"role": "system", "content": SYS_PROMPT_QA},
+        {"role": "user", "content": f"DEAL SUMMARY:\n{brief}\n" if brief is not None else "DEAL SUMMARY: (none)\n"},
+        {"role": "user", "content": f"QUESTION:\n{question}\n"},
+    ]
+
+def _explain_messages(brief: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SYS_PROMPT_EXPLAIN},
+        {"role": "user", "content": f"DEAL SUMMARY:\n{brief}\n"},
+    ]
+
+# JSON mode: the model must emit a parseable JSON object (the system prompt names the fields)
+_EXPLAIN_RESPONSE_FORMAT = {"type": "json_object"}
+
+# What _parse_explain raises on unusable output (JSONDecodeError and ValidationError are ValueErrors)
+_EXPLAIN_PARSE_ERRORS = (ValueError, TypeError, AttributeError)
+
+def _parse_explain(content: str) -> AIExplainResponse:
+    # Raises if the model returned non-JSON
+    obj = orjson.loads(content)
+    return AIExplainResponse(
+        executive_summary=str(obj.get("executive_summary", "")),
+        key_risks_explained=list(obj.get("key_risks_explained", []))[:10],
+        rm_talking_points=list(obj.get("rm_talking_points", []))[:10],
+        disclaimer=AI_DISCLAIMER,
+    )
+
+
+async def _openai_call(messages: List[Dict[str, str]], **params: Any) -> str:
+    # Single entry point for non-streaming completions: model settings live here
+    resp = await oa_client.chat.completions.create(model=MODEL_NAME, messages=messages, temperature=0.2, **params)
+    return resp.choices[0].message.content or ""
+
 
 # =========================
 # AI endpoints
 # =========================
 @app.post("/ai/explain", response_model=AIExplainResponse)
-def ai_explain(payload: AIExplainRequest):
+async def ai_explain(payload: AIExplainRequest):
     # Guard notes
     if payload.deal_summary.notes:
         _guard_no_sensitive(payload.deal_summary.notes)
 
-    # If no OpenAI, return deterministic explain
+    # Deterministic explain: built once, returned for no-OpenAI, upstream errors and non-JSON output
+    fallback = _fallback_ai_explain(payload.deal_summary)
     if not oa_client:
-        d = payload.deal_summary.model_dump()
-        dr = d.get("deal_readiness", {}) or {}
-        return AIExplainResponse(
-            executive_summary=d.get("mandate_fit_summary", ""),
-            key_risks_explained=(dr.get("constraints", []) or [])[:6],
-            rm_talking_points=(d.get("talking_points", []) or [])[:6],
-            disclaimer=_ai_disclaimer(),
-        )
+        return fallback
 
-    prompt = (
-        "You are a corporate banking RM copilot. You must be concise, practical, and risk-aware.\n"
-        "You must NOT invent data. Use only the deal summary.\n\n"
-        f"DEAL SUMMARY:\n{_deal_to_brief(payload.deal_summary)}\n"
-        "Task: produce (1) an executive summary (2) key risks explained (bullets) "
-        "(3) RM talking points (bullets)."
-    )
+    brief = _deal_to_brief(payload.deal_summary)
+    key = ai_cache.cache_key("explain", MODEL_NAME, brief)
+    cached = _EXPLAIN_CACHE.get(key)
+    if cached is not None:
+        return cached
 
     try:
-        resp = oa_client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "Return JSON only, matching the requested fields."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-        )
-        content = resp.choices[0].message.content or ""
+        content = await _openai_call(_explain_messages(brief), response_format=_EXPLAIN_RESPONSE_FORMAT)
     except Exception:
-        d = payload.deal_summary.model_dump()
-        dr = d.get("deal_readiness", {}) or {}
-        return AIExplainResponse(
-            executive_summary=d.get("mandate_fit_summary", ""),
-            key_risks_explained=(dr.get("constraints", []) or [])[:6],
-            rm_talking_points=(d.get("talking_points", []) or [])[:6],
-            disclaimer=_ai_disclaimer(),
+        return fallback
+
+    try:
+        result = _parse_explain(content)
+        _EXPLAIN_CACHE.set(key, result)
+        return result
+    except _EXPLAIN_PARSE_ERRORS:
+        # Rare with JSON mode (e.g. output truncated at the token limit)
+        return fallback
+
+
+@app.post("/ai/explain/bulk", response_model=AIExplainBulkJob)
+async def ai_explain_bulk(payloads: List[AIExplainRequest]):
+    # Offline portfolio enrichment: queued on the OpenAI Batch API (half price, separate rate-limit pool)
+    if not oa_client:
+        raise HTTPException(status_code=503, detail="OpenAI is not configured; bulk explain is unavailable.")
+    if not payloads or len(payloads) > batch_ai.MAX_REQUESTS_PER_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Submit between 1 and {batch_ai.MAX_REQUESTS_PER_BATCH} deals per bulk job.",
         )
+    for p in payloads:
+        _guard_no_sensitive(p.deal_summary.notes or "")
 
-    # Minimal robust JSON parsing without extra deps
-    import json
+    from openai import APIError  # importable whenever oa_client is set
 
     try:
-        obj = json.loads(content)
-        return AIExplainResponse(
-            executive_summary=str(obj.get("executive_summary", "")),
-            key_risks_explained=list(obj.get("key_risks_explained", []))[:10],
-            rm_talking_points=list(obj.get("rm_talking_points", []))[:10],
-            disclaimer=_ai_disclaimer(),
-        )
-    except Exception:
-        # If model returned non-JSON, fallback
-        d = payload.deal_summary.model_dump()
-        dr = d.get("deal_readiness", {}) or {}
-        return AIExplainResponse(
-            executive_summary=d.get("mandate_fit_summary", ""),
-            key_risks_explained=(dr.get("constraints", []) or [])[:6],
-            rm_talking_points=(d.get("talking_points", []) or [])[:6],
-            disclaimer=_ai_disclaimer(),
+        batch = await batch_ai.submit_chat_batch(
+            oa_client,
+            model=MODEL_NAME,
+            conversations=[_explain_messages(_deal_to_brief(p.deal_summary)) for p in payloads],
+            temperature=0.2,
+            response_format=_EXPLAIN_RESPONSE_FORMAT,
         )
+    except APIError:
+        raise HTTPException(status_code=502, detail="Could not submit the bulk job to OpenAI.")
+    return AIExplainBulkJob(job_id=batch.id, status=batch.status, request_count=len(payloads))
 
 
-@app.post("/ai/qa", response_model=AIQAResponse)
-def ai_qa(payload: AIQARequest):
+@app.get("/ai/explain/bulk/{job_id}", response_model=AIExplainBulkResult)
+async def ai_explain_bulk_status(job_id: str):
+    if not oa_client:
+        raise HTTPException(status_code=503, detail="OpenAI is not configured; bulk explain is unavailable.")
+
+    from openai import APIError, NotFoundError  # importable whenever oa_client is set
+
+    try:
+        status, outputs = await batch_ai.fetch_chat_batch(oa_client, job_id)
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail=f"Unknown bulk job: {job_id}.")
+    except APIError:
+        raise HTTPException(status_code=502, detail="Could not fetch the bulk job from OpenAI.")
+    items: List[AIExplainBulkItem] = []
+    for out in outputs:
+        result, error = None, out.error
+        if out.content is not None:
+            try:
+                result = _parse_explain(out.content)
+            except _EXPLAIN_PARSE_ERRORS:
+                error = "Model returned non-JSON output."
+        items.append(AIExplainBulkItem(index=out.index, result=result, error=error))
+    return AIExplainBulkResult(job_id=job_id, status=status, results=items)
+
+
+async def _answer_qa(payload: AIQARequest) -> AIQAResponse:
     _guard_no_sensitive(payload.question)
 
     # Deterministic if no AI
     if not oa_client:
         return AIQAResponse(
             answer=_fallback_ai_qa(payload.question, payload.deal_summary),
-            disclaimer=_ai_disclaimer(),
+            disclaimer=AI_DISCLAIMER,
         )
 
     deal = payload.deal_summary
     if deal and deal.notes:
         _guard_no_sensitive(deal.notes)
 
-    prompt = (
-        "You are a corporate banking RM copilot. Answer the user's question using ONLY the deal summary.\n"
-        "If the deal summary is missing something, say what is missing and propose RM next steps.\n"
-        "Be concise and structured.\n\n"
-        + (f"DEAL SUMMARY:\n{_deal_to_brief(deal)}\n" if deal else "DEAL SUMMARY: (none)\n")
-        + f"QUESTION:\n{payload.question}\n"
-    )
+    # Exact hit first, then (optionally) a paraphrase of a question already asked about this deal
+    brief = _deal_to_brief(deal) if deal else None
+    scope = ai_cache.cache_key("qa", MODEL_NAME, brief or "")
+    key = ai_cache.cache_key(scope, ai_cache.normalize_question(payload.question))
+    cached = _QA_CACHE.get(key)
+    if cached is not None:
+        return cached
+    embedding = None
+    if AI_SEMANTIC_CACHE:
+        embedding = await ai_cache.embed(oa_client, EMBEDDING_MODEL, payload.question)
+        cached = _QA_SEMANTIC_CACHE.lookup(scope, embedding) if embedding else None
+        if cached is not None:
+            return cached
 
     try:
-        resp = oa_client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "Be concise. Avoid hallucinations. No confidential data."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-        )
-        answer = (resp.choices[0].message.content or "").strip()
+        answer = (await _openai_call(_qa_messages(payload.question, brief))).strip()
         if not answer:
             answer = _fallback_ai_qa(payload.question, deal)
-        return AIQAResponse(answer=answer, disclaimer=_ai_disclaimer())
+            return AIQAResponse(answer=answer, disclaimer=AI_DISCLAIMER)
+        result = AIQAResponse(answer=answer, disclaimer=AI_DISCLAIMER)
+        _QA_CACHE.set(key, result)
+        if embedding:
+            _QA_SEMANTIC_CACHE.add(scope, embedding, result)
+        return result
     except Exception:
         return AIQAResponse(
             answer=_fallback_ai_qa(payload.question, deal),
-            disclaimer=_ai_disclaimer(),
+            disclaimer=AI_DISCLAIMER,
         )
 
 
+@app.post("/ai/qa", response_model=AIQAResponse)
+async def ai_qa(payload: AIQARequest):
+    return await _answer_qa(payload)
+
+
+async def _answer_qa_batched(payload: AIQARequest) -> AIQAResponse:
+    async with _QA_BATCH_SEMAPHORE:
+        return await _answer_qa(payload)
+
+
+@app.post("/ai/qa/batch", response_model=List[AIQAResponse])
+async def ai_qa_batch(payloads: List[AIQARequest]):
+    # Reject the whole batch up front rather than half-answering it
+    for p in payloads:
+        _guard_no_sensitive(p.question, (p.deal_summary.notes if p.deal_summary else None) or "")
+
+    # All questions go out concurrently; the semaphore keeps us under upstream rate limits
+    results = await asyncio.gather(*[_answer_qa_batched(p) for p in payloads], return_exceptions=True)
+    return [
+        r if isinstance(r, AIQAResponse)
+        else AIQAResponse(answer=_fallback_ai_qa(p.question, p.deal_summary), disclaimer=AI_DISCLAIMER)
+        for p, r in zip(payloads, results)
+    ]
+
+
 # =========================
-# SPA (serve built frontend)
+# Streaming AI endpoints (Server-Sent Events)
 # =========================
-from fastapi.responses import FileResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+def _sse(data: str, event: Optional[str] = None) -> str:
+    # JSON-encode each chunk so newlines inside model output don't break SSE framing
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {orjson.dumps(data).decode()}\n\n"
+
+async def _stream_chat(messages: List[Dict[str, str]], fallback: str, **params: Any) -> AsyncIterator[str]:
+    sent = False
+    if oa_client:
+        # Hard deadline for the whole stream so 30s+ upstream outliers don't hold the client.
+        # Enforced per await (not around the yields) so only upstream waits can time out.
+        # Streams take no concurrency slot: nothing waits before the deadline starts, and a
+        # slow-reading client can't pin a slot that other calls need.
+        deadline = asyncio.get_running_loop().time() + AI_STREAM_TIMEOUT
+
+        def remaining() -> float:
+            return max(0.0, deadline - asyncio.get_running_loop().time())
+
+        stream = None
+        try:
+            stream = await asyncio.wait_for(
+                oa_client.chat.completions.create(
+                    model=MODEL_NAME,
+                    messages=messages,
+                    temperature=0.2,
+                    stream=True,
+                    **params,
+                ),
+                timeout=remaining(),
+            )
+            chunks = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining())
+                except StopAsyncIteration:
+                    break
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    sent = True
+                    yield _sse(delta)
+        except asyncio.TimeoutError:
+            if sent:
+                yield _sse("Upstream AI stream timed out.", event="error")
+        except Exception:
+            if sent:
+                yield _sse("Upstream AI stream interrupted.", event="error")
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception:
+                    pass
+    if not sent:
+        yield _sse(fallback)
+    yield _sse(AI_DISCLAIMER, event="done")
+
+
+@app.post("/ai/explain/stream")
+async def ai_explain_stream(payload: AIExplainRequest):
+    if payload.deal_summary.notes:
+        _guard_no_sensitive(payload.deal_summary.notes)
+    fallback = _fallback_ai_explain(payload.deal_summary).model_dump_json()
+    # The brief is only built when it will actually be sent upstream
+    messages = _explain_messages(_deal_to_brief(payload.deal_summary)) if oa_client else []
+    return StreamingResponse(
+        _stream_chat(messages, fallback, response_format=_EXPLAIN_RESPONSE_FORMAT),
+        media_type="text/event-stream",
+    )
 
+
+@app.post("/ai/qa/stream")
+async def ai_qa_stream(payload: AIQARequest):
+    deal = payload.deal_summary
+    _guard_no_sensitive(payload.question, (deal.notes if deal else None) or "")
+    messages = _qa_messages(payload.question, _deal_to_brief(deal) if deal else None) if oa_client else []
+    return StreamingResponse(
+        _stream_chat(messages, _fallback_ai_qa(payload.question, deal)),
+        media_type="text/event-stream",
+    )
+
+
+# =========================
+# SPA (serve built frontend)
+# =========================
 API_DIR = Path(__file__).resolve().parent
 STATIC_DIR = API_DIR / "static"
 INDEX_HTML = STATIC_DIR / "index.html"
 
+class _ImmutableStaticFiles(StaticFiles):
+    # Vite emits content-hashed filenames, so assets can be cached forever by the browser
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 # Always mount assets (required for Vite)
 assets_dir = STATIC_DIR / "assets"
 if assets_dir.is_dir():
-    app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+    app.mount("/assets", _ImmutableStaticFiles(directory=str(assets_dir)), name="assets")
 
 _API_PREFIXES = (
     "assess",
@@ -429,12 +812,46 @@ _API_PREFIXES = (
 )
 
 if INDEX_HTML.exists():
+    # index.html is tiny and only changes on deploy: read it once instead of stat+open per navigation
+    # A gzip copy is compressed once at startup too, so no per-request compression is needed.
+    INDEX_BYTES = INDEX_HTML.read_bytes()
+    INDEX_GZ = gzip.compress(INDEX_BYTES, 6)
+    INDEX_ETAG = f'"{hashlib.sha1(INDEX_BYTES).hexdigest()}"'
+    INDEX_GZ_ETAG = INDEX_ETAG[:-1] + '-gz"'  # distinct validator per encoding
+    _INDEX_HEADERS = {"ETag": INDEX_ETAG, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    _INDEX_GZ_HEADERS = {**_INDEX_HEADERS, "ETag": INDEX_GZ_ETAG, "Content-Encoding": "gzip"}
+
+    def _accepts_gzip(accept_encoding: str) -> bool:
+        # Honour q-values: "gzip;q=0" (or "*;q=0" without gzip) means the client refuses it
+        q_by_coding: Dict[str, float] = {}
+        for item in accept_encoding.split(","):
+            coding, *params = (part.strip() for part in item.split(";"))
+            q = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            q_by_coding[coding.lower()] = q
+        return q_by_coding.get("gzip", q_by_coding.get("*", 0.0)) > 0
+
+    def _index_response(request: Request) -> Response:
+        if _accepts_gzip(request.headers.get("accept-encoding", "")):
+            body, headers = INDEX_GZ, _INDEX_GZ_HEADERS
+        else:
+            body, headers = INDEX_BYTES, _INDEX_HEADERS
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="text/html", headers=headers)
+
     @app.get("/", include_in_schema=False)
-    def spa_root():
-        return FileResponse(str(INDEX_HTML))
+    async def spa_root(request: Request):
+        return _index_response(request)
 
     @app.get("/{path:path}", include_in_schema=False)
-    def spa_fallback(path: str):
+    async def spa_fallback(path: str, request: Request):
         if path == "" or path.startswith(_API_PREFIXES):
             return JSONResponse({"detail": "Not Found"}, status_code=404)
-        return FileResponse(str(INDEX_HTML))
+        return _index_response(request)
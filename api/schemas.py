@@ -2,44 +2,85 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Dict, List, Literal, Optional, Any
+from enum import StrEnum
+from typing import Dict, List, Optional, Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-StrategicSector = Literal[
-    "Manufacturing",
-    "Advanced Technology",
-    "Healthcare",
-    "Food Security",
-    "Renewables",
-    "Other",
-]
 
-Trend3Y = Literal["Improving", "Stable", "Declining"]
-Signal3 = Literal["Strong", "Adequate", "Weak"]
-SignalLeverage = Literal["Low", "Moderate", "Elevated"]
-SignalVolatility = Literal["Low", "Moderate", "High"]
-SignalInvestment = Literal["High", "Moderate", "Low"]
+# Closed vocabularies are StrEnums: Pydantic validates them with a dict lookup instead
+# of scanning Literal choices, and use_enum_values keeps plain strings on the models.
+class StrategicSector(StrEnum):
+    MANUFACTURING = "Manufacturing"
+    ADVANCED_TECHNOLOGY = "Advanced Technology"
+    HEALTHCARE = "Healthcare"
+    FOOD_SECURITY = "Food Security"
+    RENEWABLES = "Renewables"
+    OTHER = "Other"
 
-DealReadinessStatus = Literal["Strong", "Conditional", "Weak"]
 
+class Trend3Y(StrEnum):
+    IMPROVING = "Improving"
+    STABLE = "Stable"
+    DECLINING = "Declining"
 
-class RatingAnchorIn(BaseModel):
+
+class MarginTrend3Y(StrEnum):
+    IMPROVING = "Improving"
+    STABLE = "Stable"
+    UNDER_PRESSURE = "Under Pressure"
+
+
+class Signal3(StrEnum):
+    STRONG = "Strong"
+    ADEQUATE = "Adequate"
+    WEAK = "Weak"
+
+
+class SignalLeverage(StrEnum):
+    LOW = "Low"
+    MODERATE = "Moderate"
+    ELEVATED = "Elevated"
+
+
+class SignalVolatility(StrEnum):
+    LOW = "Low"
+    MODERATE = "Moderate"
+    HIGH = "High"
+
+
+class SignalInvestment(StrEnum):
+    HIGH = "High"
+    MODERATE = "Moderate"
+    LOW = "Low"
+
+
+class DealReadinessStatus(StrEnum):
+    STRONG = "Strong"
+    CONDITIONAL = "Conditional"
+    WEAK = "Weak"
+
+
+class _Schema(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", use_enum_values=True)
+
+
+class RatingAnchorIn(_Schema):
     system: str = Field(..., description="Source system for rating (Credit Lens / Moody's).")
     grade: str = Field(..., description="Rating grade as provided by the source system.")
     outlook: Optional[str] = Field(None, description="Stable/Negative/Positive (if available).")
     as_of: Optional[date] = Field(None, description="Rating date (if available).")
 
 
-class EligibilityIn(BaseModel):
+class EligibilityIn(_Schema):
     score: float = Field(..., ge=0.0, le=6.0, description="Eligibility score (0.0 to 6.0).")
     drivers: List[str] = Field(default_factory=list, description="Short bullets explaining the score.")
     breakdown: Dict[str, float] = Field(default_factory=dict, description="Optional component scores.")
 
 
-class FinancialSignalsIn(BaseModel):
+class FinancialSignalsIn(_Schema):
     revenue_trend_3y: Trend3Y
-    margin_trend_3y: Literal["Improving", "Stable", "Under Pressure"]
+    margin_trend_3y: MarginTrend3Y
     leverage_position: SignalLeverage
     cashflow_quality: Signal3
     earnings_volatility: SignalVolatility
@@ -47,7 +88,7 @@ class FinancialSignalsIn(BaseModel):
     financial_transparency: Signal3
 
 
-class DealInputRequest(BaseModel):
+class DealInputRequest(_Schema):
     client_name: str
     group_name: Optional[str] = None
     sector: StrategicSector
@@ -66,13 +107,13 @@ class DealInputRequest(BaseModel):
         return v
 
 
-class DealReadinessOut(BaseModel):
+class DealReadinessOut(_Schema):
     status: DealReadinessStatus
     strengths: List[str] = Field(default_factory=list)
     constraints: List[str] = Field(default_factory=list)
 
 
-class DealSummaryResponse(BaseModel):
+class DealSummaryResponse(_Schema):
     client_name: str
     group_name: Optional[str] = None
     sector: StrategicSector
@@ -95,20 +136,34 @@ class DealSummaryResponse(BaseModel):
 # AI schemas (Explain + Q&A)
 # ===============================
 
-class AIQARequest(BaseModel):
+class AIQARequest(_Schema):
     question: str = Field(..., description="User question about the deal summary.")
     deal_summary: Optional[DealSummaryResponse] = None
 
-class AIQAResponse(BaseModel):
+class AIQAResponse(_Schema):
     answer: str
     disclaimer: str
 
-class AIExplainRequest(BaseModel):
+class AIExplainRequest(_Schema):
     deal_summary: DealSummaryResponse
 
-class AIExplainResponse(BaseModel):
+class AIExplainResponse(_Schema):
     executive_summary: str
     key_risks_explained: List[str] = Field(default_factory=list)
     rm_talking_points: List[str] = Field(default_factory=list)
     disclaimer: str
 
+class AIExplainBulkJob(_Schema):
+    job_id: str
+    status: str
+    request_count: int
+
+class AIExplainBulkItem(_Schema):
+    index: int = Field(..., description="Position of the deal in the submitted list.")
+    result: Optional[AIExplainResponse] = None
+    error: Optional[str] = None
+
+class AIExplainBulkResult(_Schema):
+    job_id: str
+    status: str
+    results: List[AIExplainBulkItem] = Field(default_factory=list)
@@ -11,7 +11,7 @@ This file defines the single source of truth for the Deal Summary that powers:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import date
 from typing import Any, Dict, List, Literal, Optional
 
@@ -86,15 +86,40 @@ class DealSummary:
     notes: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-
-        def _convert(obj: Any) -> Any:
-            if isinstance(obj, date):
-                return obj.isoformat()
-            if isinstance(obj, dict):
-                return {k: _convert(v) for k, v in obj.items()}
-            if isinstance(obj, list):
-                return [_convert(v) for v in obj]
-            return obj
-
-        return _convert(d)
+        # Built in one pass (no asdict deep copy + second walk); lists/dicts are still copied
+        ra, el, fs, dr = self.rating_anchor, self.eligibility, self.financial_signals, self.deal_readiness
+        return {
+            "client_name": self.client_name,
+            "group_name": self.group_name,
+            "sector": self.sector,
+            "rating_anchor": {
+                "system": ra.system,
+                "grade": ra.grade,
+                "outlook": ra.outlook,
+                "as_of": ra.as_of.isoformat() if ra.as_of else None,
+            },
+            "eligibility": {
+                "score": el.score,
+                "drivers": list(el.drivers),
+                "breakdown": dict(el.breakdown),
+            },
+            "financial_signals": {
+                "revenue_trend_3y": fs.revenue_trend_3y,
+                "margin_trend_3y": fs.margin_trend_3y,
+                "leverage_position": fs.leverage_position,
+                "cashflow_quality": fs.cashflow_quality,
+                "earnings_volatility": fs.earnings_volatility,
+                "capex_growth_investment": fs.capex_growth_investment,
+                "financial_transparency": fs.financial_transparency,
+            },
+            "deal_readiness": {
+                "status": dr.status,
+                "strengths": list(dr.strengths),
+                "constraints": list(dr.constraints),
+            },
+            "mandate_fit_summary": self.mandate_fit_summary,
+            "rm_actions": list(self.rm_actions),
+            "talking_points": list(self.talking_points),
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "notes": self.notes,
+        }